@@ -1,33 +1,28 @@
 import logging
 import asyncio
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-import urllib3
-from telegram import Bot
+import aiohttp
+from lxml import etree, html as lxml_html
+from telegram import Bot, InputFile
 from telegram.constants import PollType
-from telegram.error import TelegramError
-from datetime import datetime
+from telegram.error import TelegramError, RetryAfter, NetworkError, BadRequest
+from datetime import datetime, timedelta
 import os
 import pytz
-import pymongo
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient
+from pymongo.errors import BulkWriteError
 import io
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-import tempfile
-import time
-import subprocess
-
-# Disable SSL/TLS-related warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from xml.sax.saxutils import escape
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTFError
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 
 # Configuration from environment variables
 MONGO_CONNECTION_STRING = os.environ.get('MONGO_CONNECTION_STRING')
 TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')  # Use chat_id directly
-TEMPLATE_URL = os.environ.get('TEMPLATE_URL')
 TELEGRAM_CHANNEL_URL = "https://t.me/daily_current_all_source"  # Replace with your actual channel URL
 
 # Validate that TELEGRAM_CHAT_ID is set and not empty
@@ -37,30 +32,92 @@ if not TELEGRAM_CHAT_ID:
 DB_NAME = 'IndiaBixEnglish'
 COLLECTION_NAME = 'urls'
 
+INDEX_URL = "https://www.indiabix.com/current-affairs/questions-and-answers/"
+
+POLL_MIN_INTERVAL = 1.0  # Seconds between poll send starts; ~1 poll/s is Telegram's per-chat limit
+POLL_SEND_ATTEMPTS = 4
+PDF_SEND_ATTEMPTS = 4
+
+SCRAPE_BATCH_SIZE = 50  # Max concurrent page fetches per batch
+
+REQUEST_TIMEOUT = 10  # Seconds, per connect and per read
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=REQUEST_TIMEOUT, sock_read=REQUEST_TIMEOUT)
+HTTP_HEADERS = {'Accept-Encoding': 'gzip, deflate', 'User-Agent': 'Mozilla/5.0'}
+
+# Unicode TTF family for the PDF; the base Helvetica fonts only cover WinAnsi and drop characters
+# like the rupee sign or Devanagari. GNU FreeFont covers both (apt package fonts-freefont-ttf).
+PDF_FONT_DIR = os.environ.get('PDF_FONT_DIR', '/usr/share/fonts/truetype/freefont')
+PDF_FONT_FILES = {
+    'QuizSans': 'FreeSans.ttf',
+    'QuizSans-Bold': 'FreeSansBold.ttf',
+    'QuizSans-Oblique': 'FreeSansOblique.ttf',
+    'QuizSans-BoldOblique': 'FreeSansBoldOblique.ttf',
+}
+
+# Built on the first PDF, so a missing font directory never breaks polls
+_pdf_styles = None
+
+# Quiz page selectors, compiled once; the class tests match one class among several like BeautifulSoup's class_
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_XP_CONTAINER = etree.XPath(f"//div[{_has_class('bix-div-container')}]")
+_XP_QTXT = etree.XPath(f".//div[{_has_class('bix-td-qtxt')}]")
+_XP_OPTION_ROWS = etree.XPath(f"(.//div[{_has_class('bix-tbl-options')}])[1]//div[{_has_class('bix-opt-row')}]")
+_XP_OPTION_VAL = etree.XPath(f".//div[{_has_class('bix-td-option-val')}]")
+_XP_HIDDEN_VALUE = etree.XPath(f".//input[{_has_class('jq-hdnakq')}]/@value")
+_XP_EXPLANATION = etree.XPath(f"(.//div[{_has_class('bix-div-answer')}])[1]//div[{_has_class('bix-ans-description')}]")
+
+_PROMO_MARKUP = (
+    "Join our Telegram Channel for daily quizzes and updates: "
+    f'<font size="19" color="#0066CC"><link href="{TELEGRAM_CHANNEL_URL}">{TELEGRAM_CHANNEL_URL}</link></font>'
+)
+
+# Enhanced caption with symbols and design elements
+_CAPTION_TEMPLATE = (
+    "🎯 Current Affairs Quiz - {date}\n\n"
+    "📝 PDF Contents:\n"
+    "• Total Questions: {count}\n\n"
+    "🔍 Boost Your Knowledge: Stay updated with daily quizzes and enhance your knowledge!\n\n"
+    "💡 For More Quizzes:\n"
+    "Join our Telegram channel @Daily_Current_All_Source to receive daily updates.\n"
+    "🚀 Stay Ahead, Stay Informed!\n\n"
+    "⚡️ Test your knowledge today! 📊"
+)
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Answer letter -> option index, built once instead of per poll
+_OPTION_MAPPING = {chr(65+i): i for i in range(26)}
+
+def _trunc(text, max_length):
+    return text if len(text) <= max_length else text[:max_length-3] + '...'
+
 class TelegramQuizBot:
-    def __init__(self, token, chat_id):
-        self.bot = Bot(token=token)
+    def __init__(self, bot, chat_id):
+        self.bot = bot
         self.chat_id = chat_id
+        self.next_poll_at = 0.0  # Event-loop time before which the next poll may not start
 
-    def truncate_text(self, text, max_length):
-        return text[:max_length-3] + '...' if len(text) > max_length else text
+    async def wait_for_poll_turn(self):
+        loop = asyncio.get_running_loop()
+        delay = self.next_poll_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.next_poll_at = loop.time() + POLL_MIN_INTERVAL
 
     async def send_poll(self, question_doc):
         # Append @daily_current_all_source to the question text
-        question = self.truncate_text(question_doc["question"], 300) + " @daily_current_all_source"
-        options = [self.truncate_text(opt, 100) for opt in question_doc["options"]]
+        question = _trunc(question_doc["question"], 300) + " @daily_current_all_source"
+        options = [_trunc(opt, 100) for opt in question_doc["options"]]
         correct_option = question_doc["value_in_braces"]
-        explanation = self.truncate_text(question_doc["explanation"], 200)
-
-        option_mapping = {chr(65+i): i for i in range(len(options))}
+        explanation = _trunc(question_doc["explanation"], 200)
 
         try:
-            correct_option_id = option_mapping.get(correct_option)
-            if correct_option_id is None:
+            correct_option_id = _OPTION_MAPPING.get(correct_option)
+            if correct_option_id is None or correct_option_id >= len(options):
                 logger.error(f"Correct option '{correct_option}' not found in options: {options}")
                 return
 
@@ -76,63 +133,89 @@ class TelegramQuizBot:
             )
             logger.info(f"Sent poll: {question}")
 
+        except RetryAfter:
+            # Let the caller back off and retry
+            raise
         except TelegramError as e:
             logger.error(f"Failed to send poll: {e.message}")
             logger.error(f"Full error details: {e}")
 
-def get_current_month():
+# Quiz links for the current IST month, e.g. /current-affairs/2024-08-
+def get_quiz_link_prefix():
     ist = pytz.timezone('Asia/Kolkata')
     current_date = datetime.now(ist)
-    return f"{current_date.month:02d}"
+    return f"/current-affairs/{current_date.year}-{current_date.month:02d}-"
 
 def connect_to_mongo():
-    client = MongoClient(MONGO_CONNECTION_STRING)
+    client = AsyncMongoClient(MONGO_CONNECTION_STRING)
     db = client[DB_NAME]
     collection = db[COLLECTION_NAME]
     return collection
 
-# Gracefully handle documents without 'url' field
-def get_scraped_urls(collection):
-    urls = set()
-    for doc in collection.find({}, {'url': 1}):
-        url = doc.get('url')
-        if url:
-            urls.add(url)
-        else:
-            logger.warning(f"Document without 'url' field encountered: {doc}")
-    return urls
+# Unique index on 'url' so dedup lookups are index scans and duplicates are rejected
+async def ensure_url_index(collection):
+    await collection.create_index('url', unique=True)
+
+# Only look up the candidate URLs instead of pulling every stored document
+async def get_scraped_urls(collection, urls):
+    if not urls:
+        return set()
+    return set(await collection.distinct('url', {'url': {'$in': list(urls)}}))
 
 # Clean up documents missing 'url' field
-def clean_up_documents_without_url(collection):
-    result = collection.delete_many({"url": {"$exists": False}})
+async def clean_up_documents_without_url(collection):
+    result = await collection.delete_many({"url": {"$exists": False}})
     logger.info(f"Deleted {result.deleted_count} documents without 'url' field.")
 
-def store_scraped_urls(collection, urls):
-    for url in urls:
-        collection.update_one({'url': url}, {'$set': {'url': url}}, upsert=True)
+# The cleanup must run first: the unique index can't be built while several docs lack 'url'
+async def prepare_collection(collection):
+    await clean_up_documents_without_url(collection)
+    await ensure_url_index(collection)
 
-def scrape_latest_questions(latest_link):
+# Returns only the URLs this call inserted, so a URL already claimed by another run is skipped
+async def store_scraped_urls(collection, urls):
+    if not urls:
+        return []
     try:
-        response = requests.get(latest_link, verify=False)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        await collection.insert_many([{'url': url} for url in urls], ordered=False)
+        return list(urls)
+    except BulkWriteError as e:
+        # Duplicate-key errors (11000) mean another run stored that URL first; anything else is a real failure
+        errors = e.details.get('writeErrors', [])
+        if any(error['code'] != 11000 for error in errors):
+            raise
+        duplicates = {error['index'] for error in errors}
+        return [url for i, url in enumerate(urls) if i not in duplicates]
+
+def chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+async def scrape_latest_questions(session, latest_link):
+    logger.info(f"Scraping link: {latest_link}")
+    try:
+        async with session.get(latest_link, ssl=False) as response:
+            response.raise_for_status()
+            html = await response.read()
+            # Parse bytes with the HTTP charset: lxml guesses Latin-1 without a <meta charset>,
+            # and rejects str input that carries an XML encoding declaration
+            parser = lxml_html.HTMLParser(encoding=response.get_encoding())
+        root = lxml_html.fromstring(html, parser=parser)
 
         question_docs = []
 
-        question_divs = soup.find_all("div", class_="bix-div-container")
-
-        for question_div in question_divs:
+        for question_div in _XP_CONTAINER(root):
             try:
-                qtxt = question_div.find("div", class_="bix-td-qtxt").text.strip()
-                options_div = question_div.find("div", class_="bix-tbl-options")
-                option_rows = options_div.find_all("div", class_="bix-opt-row")
-                options = [option_row.find("div", class_="bix-td-option-val").text.strip() for option_row in option_rows]
+                # Missing elements raise IndexError and skip just this question
+                qtxt = _XP_QTXT(question_div)[0].text_content().strip()
+                options = [_XP_OPTION_VAL(option_row)[0].text_content().strip() for option_row in _XP_OPTION_ROWS(question_div)]
+                if not options:
+                    raise ValueError("question has no options")
 
-                hidden_input = question_div.find("input", class_="jq-hdnakq")
-                value_in_braces = hidden_input['value'].split('{', 1)[-1].rsplit('}', 1)[0] if hidden_input and 'value' in hidden_input.attrs else ""
+                hidden_values = _XP_HIDDEN_VALUE(question_div)
+                value_in_braces = hidden_values[0].split('{', 1)[-1].rsplit('}', 1)[0] if hidden_values else ""
 
-                answer_div = question_div.find("div", class_="bix-div-answer")
-                explanation = answer_div.find("div", class_="bix-ans-description").text.strip()
+                explanation = _XP_EXPLANATION(question_div)[0].text_content().strip()
 
                 question_doc = {
                     "question": qtxt,
@@ -148,128 +231,157 @@ def scrape_latest_questions(latest_link):
 
         return question_docs
 
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         logger.error(f"Error fetching URL: {e}")
         return []
+    except etree.ParserError as e:
+        logger.error(f"Error parsing {latest_link}: {e}")
+        return []
 
-async def send_new_questions_to_telegram(new_questions):
-    bot = TelegramQuizBot(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
-    for question in new_questions:
-        await bot.send_poll(question)
-        await asyncio.sleep(3)  # Rate limit to avoid spamming
-
-def insert_content_from_top(doc, content_list):
-    for content in content_list:
-        new_para = doc.add_paragraph()
-        run = new_para.add_run(content['text'])
-        
-        if content['type'] == 'question':
-            run.bold = True
-            new_para.paragraph_format.space_after = Pt(10)
-            new_para.paragraph_format.space_before = Pt(10)
-            run.font.size = Pt(14)
-            
-        elif content['type'] in ['options']:
-            new_para.paragraph_format.left_indent = Pt(20)
-            run.font.size = Pt(12)
-            new_para.paragraph_format.space_after = Pt(6)
-            
-        elif content['type'] == 'answer':
-            run.bold = True
-            run.underline = True
-            run.font.size = Pt(12)
-            new_para.paragraph_format.space_before = Pt(10)
-            
-        elif content['type'] == 'explanation':
-            run.italic = True
-            run.font.size = Pt(12)
-            new_para.paragraph_format.space_after = Pt(10)
-            
-        new_para.paragraph_format.line_spacing = 1.5
-
-    add_promotional_message(doc)
-
-def add_promotional_message(doc):
-    para = doc.add_paragraph()
-    para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    
-    run = para.add_run("📢 Join our Telegram Channel for daily quizzes and updates: ")
-    run.bold = True
-    run.font.size = Pt(14)
-    
-    url_run = para.add_run(f" {TELEGRAM_CHANNEL_URL}")
-    url_run.font.color.rgb = RGBColor(0, 102, 204)
-    url_run.font.size = Pt(19)
-    url_run.bold = True
-
-def prepare_content_list(question_docs):
-    content_list = []
-    for i, question in enumerate(question_docs, 1):
-        content_list.extend([
-            {'type': 'question', 'text': f"Question {i}: {question['question']}"},
-            {'type': 'options', 'text': "Options:"},
-            *[{'type': 'options', 'text': f"{chr(65+j)}. {opt}"} for j, opt in enumerate(question['options'])],
-            {'type': 'answer', 'text': f"Correct Answer: {question['value_in_braces']}"},
-            {'type': 'explanation', 'text': f"Explanation: {question['explanation']}"},
-            {'type': 'space', 'text': "\n"}
-        ])
-    return content_list
-
-def download_template(url):
-    download_url = url.replace('/edit?usp=sharing', '/export?format=docx')
-    try:
-        response = requests.get(download_url)
+async def scrape_all_questions(session, links):
+    # Results are returned in the same order as links
+    results = []
+    for batch in chunks(links, SCRAPE_BATCH_SIZE):
+        batch_results = await asyncio.gather(*[scrape_latest_questions(session, link) for link in batch], return_exceptions=True)
+        for link, result in zip(batch, batch_results):
+            # One bad page yields no questions instead of sinking every link
+            if isinstance(result, Exception):
+                logger.error(f"Error scraping {link}: {result}")
+                result = []
+            results.append(result)
+    return results
+
+def retry_after_seconds(error):
+    # RetryAfter.retry_after is an int or a timedelta depending on the python-telegram-bot version
+    delay = error.retry_after
+    return delay.total_seconds() if isinstance(delay, timedelta) else delay
+
+async def fetch_index_page(session):
+    async with session.get(INDEX_URL, ssl=False) as response:
         response.raise_for_status()
-        return io.BytesIO(response.content)
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error downloading template: {e}")
-        raise
-
-def convert_docx_to_pdf(docx_path, pdf_path):
-    try:
-        output_dir = os.path.dirname(pdf_path)
-        result = subprocess.run(['libreoffice', '--headless', '--convert-to', 'pdf', '--outdir', output_dir, docx_path], 
-                                check=True, capture_output=True, text=True)
-        logger.info(f"LibreOffice conversion output: {result.stdout}")
-        logger.error(f"LibreOffice conversion error output: {result.stderr}")
-        
-        pdf_temp_path = os.path.join(output_dir, os.path.splitext(os.path.basename(docx_path))[0] + '.pdf')
-        if os.path.exists(pdf_temp_path):
-            os.rename(pdf_temp_path, pdf_path)
-            logger.info(f"Successfully converted DOCX to PDF: {pdf_path}")
-        else:
-            raise FileNotFoundError(f"PDF file not found at expected location: {pdf_temp_path}")
-    except subprocess.CalledProcessError as e:
-        logger.error(f"LibreOffice conversion failed: {e}")
-        raise
-    except Exception as e:
-        logger.error(f"Error converting DOCX to PDF: {e}")
-        raise
-
-async def send_pdf_to_telegram(bot, chat_id, pdf_path, caption):
+        return await response.read()
+
+# Stream-parse the index page and keep only the quiz anchors instead of building a full DOM
+def extract_quiz_hrefs(html):
+    parser = etree.HTMLPullParser(events=('end',), tag='a')
+    parser.feed(html)
+    parser.close()
+
+    hrefs = []
+    for _, element in parser.read_events():
+        classes = (element.get('class') or '').split()
+        href = element.get('href')
+        if 'text-link' in classes and 'me-3' in classes and href:
+            hrefs.append(href)
+        element.clear()
+    return hrefs
+
+async def send_new_questions_to_telegram(bot, new_questions):
+    # One poll at a time so they reach the channel in question (and PDF) order
+    for question in new_questions:
+        for attempt in range(POLL_SEND_ATTEMPTS):
+            try:
+                await bot.wait_for_poll_turn()
+                await bot.send_poll(question)
+                break
+            except RetryAfter as e:
+                # Retry in place, so a rate-limited poll doesn't fall behind the next one
+                if attempt == POLL_SEND_ATTEMPTS - 1:
+                    logger.error(f"Dropping poll after {POLL_SEND_ATTEMPTS} rate-limited attempts: {question['question']}")
+                    break
+                logger.warning(f"Rate limited, retrying poll in {retry_after_seconds(e)} seconds")
+                await asyncio.sleep(retry_after_seconds(e))
+
+def register_pdf_fonts():
     try:
-        with open(pdf_path, 'rb') as pdf_file:
+        for font_name, file_name in PDF_FONT_FILES.items():
+            pdfmetrics.registerFont(TTFont(font_name, os.path.join(PDF_FONT_DIR, file_name)))
+        pdfmetrics.registerFontFamily('QuizSans', normal='QuizSans', bold='QuizSans-Bold',
+                                      italic='QuizSans-Oblique', boldItalic='QuizSans-BoldOblique')
+        return 'QuizSans', 'QuizSans-Bold', 'QuizSans-Oblique'
+    except TTFError as e:
+        logger.warning(f"PDF fonts unavailable, falling back to Helvetica (non-WinAnsi characters will not render): {e}")
+        return 'Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique'
+
+# PDF paragraph styles per content type (sizes in points, 1.5 line spacing)
+def get_pdf_styles():
+    global _pdf_styles
+    if _pdf_styles is None:
+        regular, bold, oblique = register_pdf_fonts()
+        _pdf_styles = {
+            'question': ParagraphStyle('QuizQuestion', fontName=bold, fontSize=14, leading=21, spaceBefore=10, spaceAfter=10),
+            'options': ParagraphStyle('QuizOption', fontName=regular, fontSize=12, leading=18, leftIndent=20, spaceAfter=6),
+            'answer': ParagraphStyle('QuizAnswer', fontName=bold, fontSize=12, leading=18, spaceBefore=10),
+            'explanation': ParagraphStyle('QuizExplanation', fontName=oblique, fontSize=12, leading=18, spaceAfter=10),
+            'promo': ParagraphStyle('QuizPromo', fontName=bold, fontSize=14, leading=28, alignment=TA_CENTER, spaceBefore=20),
+        }
+    return _pdf_styles
+
+def build_quiz_pdf(content):
+    styles = get_pdf_styles()
+    story = []
+    for content_type, text in content:
+        if content_type == 'space':
+            story.append(Spacer(1, 12))
+            continue
+
+        text = escape(text)
+        if content_type == 'answer':
+            text = f"<u>{text}</u>"
+        story.append(Paragraph(text, styles[content_type]))
+
+    story.append(promotional_paragraph(styles))
+
+    with io.BytesIO() as buffer:
+        SimpleDocTemplate(buffer, pagesize=A4).build(story)
+        return buffer.getvalue()
+
+def promotional_paragraph(styles):
+    # Flowables keep wrap/split state from the build that laid them out, so each PDF gets its own Paragraph
+    return Paragraph(_PROMO_MARKUP, styles['promo'])
+
+def iter_content(question_docs):
+    for i, question in enumerate(question_docs, 1):
+        yield 'question', f"Question {i}: {question['question']}"
+        yield 'options', "Options:"
+        for j, opt in enumerate(question['options']):
+            yield 'options', f"{chr(65+j)}. {opt}"
+        yield 'answer', f"Correct Answer: {question['value_in_braces']}"
+        yield 'explanation', f"Explanation: {question['explanation']}"
+        yield 'space', "\n"
+
+async def send_pdf_to_telegram(bot, chat_id, pdf_bytes, filename, caption):
+    for attempt in range(PDF_SEND_ATTEMPTS):
+        try:
             await bot.send_document(
                 chat_id=chat_id,
-                document=pdf_file,
+                document=InputFile(io.BytesIO(pdf_bytes), filename=filename),
                 caption=caption
             )
-        logger.info(f"Sent PDF to chat_id: {chat_id}")
-    except TelegramError as e:
-        logger.error(f"Failed to send PDF: {e.message}")
+            logger.info(f"Sent PDF to chat_id: {chat_id}")
+            return
+        except RetryAfter as e:
+            delay = retry_after_seconds(e)
+            logger.warning(f"Rate limited sending PDF (attempt {attempt + 1})")
+        except BadRequest as e:
+            # BadRequest subclasses NetworkError but is permanent (bad caption, chat id, ...)
+            logger.error(f"Failed to send PDF: {e.message}")
+            return
+        except NetworkError as e:
+            # Covers TimedOut; back off exponentially
+            delay = 2 ** attempt
+            logger.warning(f"Network error sending PDF (attempt {attempt + 1}): {e.message}")
+        except TelegramError as e:
+            logger.error(f"Failed to send PDF: {e.message}")
+            return
+
+        if attempt < PDF_SEND_ATTEMPTS - 1:
+            await asyncio.sleep(delay)
+
+    logger.error(f"Failed to send PDF after {PDF_SEND_ATTEMPTS} attempts")
 
-# Enhanced caption with symbols and design elements
 def generate_pdf_caption(quiz_date, question_count):
-    return (
-        f"🎯 Current Affairs Quiz - {quiz_date}\n\n"
-        f"📝 PDF Contents:\n"
-        f"• Total Questions: {question_count}\n\n"
-        f"🔍 Boost Your Knowledge: Stay updated with daily quizzes and enhance your knowledge!\n\n"
-        f"💡 For More Quizzes:\n"
-        f"Join our Telegram channel @Daily_Current_All_Source to receive daily updates.\n"
-        f"🚀 Stay Ahead, Stay Informed!\n\n"
-        f"⚡️ Test your knowledge today! 📊"
-    )
+    return _CAPTION_TEMPLATE.format(date=quiz_date, count=question_count)
 
 def extract_date_from_url(url):
     parts = url.split("/")
@@ -281,68 +393,59 @@ def extract_date_from_url(url):
         logger.warning(f"Date extraction failed for URL: {url}")
         return datetime.now().strftime("%d %B %Y")
 
+async def process_link(quiz_bot, link, question_docs):
+    await send_new_questions_to_telegram(quiz_bot, question_docs)
+
+    pdf_bytes = build_quiz_pdf(iter_content(question_docs))
+
+    # One PDF per quiz date, so names stay unique within a run
+    pdf_filename = f"current_affairs_{link.split('/')[-2].replace('-', '')}.pdf"
+    quiz_date = extract_date_from_url(link)
+    caption = generate_pdf_caption(quiz_date, len(question_docs))
+    await send_pdf_to_telegram(quiz_bot.bot, quiz_bot.chat_id, pdf_bytes, pdf_filename, caption)
+
 async def main():
     collection = connect_to_mongo()
-    clean_up_documents_without_url(collection)  # Clean up documents without 'url' field (optional)
-    stored_urls = get_scraped_urls(collection)
-    
-    url = "https://www.indiabix.com/current-affairs/questions-and-answers/"
-    month_digit = get_current_month()
-
-    response = requests.get(url, verify=False)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, 'html.parser')
-    link_elements = soup.find_all("a", class_="text-link me-3")
-
-    valid_links = []
-    for link_element in link_elements:
-        href = link_element.get("href")
-        if f"/current-affairs/2024-{month_digit}-" in href:
-            full_url = urljoin("https://www.indiabix.com/", href)
-            if full_url not in stored_urls:
-                valid_links.append(full_url)
-
-    if not valid_links:
-        logger.info("No new valid links found.")
-        return
-
-    valid_links.sort(key=lambda x: datetime.strptime(x.split("/")[-2], "%Y-%m-%d"))
-
-    for link in valid_links:
-        logger.info(f"Scraping link: {link}")
-
-        question_docs = scrape_latest_questions(link)
-        
-        if question_docs:
-            store_scraped_urls(collection, [link])
-            await send_new_questions_to_telegram(question_docs)
-
-            content_list = prepare_content_list(question_docs)
-
-            template_bytes = download_template(TEMPLATE_URL)
-            doc = Document(template_bytes)
-            insert_content_from_top(doc, content_list)
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_docx:
-                doc.save(tmp_docx.name)
-
-            pdf_filename = f"current_affairs_{datetime.now().strftime('%Y%m%d')}.pdf"
-            pdf_path = os.path.abspath(pdf_filename)
-            convert_docx_to_pdf(os.path.abspath(tmp_docx.name), pdf_path)
-
-            quiz_date = extract_date_from_url(link)
-
-            bot = Bot(token=TELEGRAM_BOT_TOKEN)
-            caption = generate_pdf_caption(quiz_date, len(question_docs))
-            await send_pdf_to_telegram(bot, TELEGRAM_CHAT_ID, pdf_path, caption)
-
-            os.unlink(tmp_docx.name)
-            os.remove(pdf_path)
-        
-        else:
-            logger.info(f"No questions found for link: {link}")
-        
-        time.sleep(5)
+
+    # One HTTP session for the index page and every quiz page, and one Bot so polls and PDFs share its connection pool
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS) as session, Bot(token=TELEGRAM_BOT_TOKEN) as bot:
+        quiz_bot = TelegramQuizBot(bot, TELEGRAM_CHAT_ID)
+        prefix = get_quiz_link_prefix()
+
+        # Collection maintenance overlaps with the index page fetch
+        html, _ = await asyncio.gather(fetch_index_page(session), prepare_collection(collection))
+
+        # IndiaBix hrefs are site-relative, so plain concatenation is enough; dict.fromkeys dedups in order
+        candidate_links = list(dict.fromkeys(
+            f"https://www.indiabix.com{href}" for href in extract_quiz_hrefs(html) if href.startswith(prefix)
+        ))
+
+        stored_urls = await get_scraped_urls(collection, candidate_links)
+        valid_links = [link for link in candidate_links if link not in stored_urls]
+
+        if not valid_links:
+            logger.info("No new valid links found.")
+            return
+
+        valid_links.sort(key=lambda x: datetime.strptime(x.split("/")[-2], "%Y-%m-%d"))
+
+        scraped = await scrape_all_questions(session, valid_links)
+
+        # Links go out one at a time, oldest first, so quizzes never interleave in the channel;
+        # the chat-wide poll limiter is the real throughput bound, so running links in parallel gains nothing
+        for link, question_docs in zip(valid_links, scraped):
+            if not question_docs:
+                logger.info(f"No questions found for link: {link}")
+            # Claim each link just before posting it, so a failure never marks later links as done
+            elif not await store_scraped_urls(collection, [link]):
+                logger.info(f"Link already processed by another run: {link}")
+            else:
+                try:
+                    await process_link(quiz_bot, link, question_docs)
+                except Exception as e:
+                    # One bad link must not stop the rest of the run
+                    logger.error(f"Failed to post link {link}: {e}")
 
 if __name__ == "__main__":
     asyncio.run(main())